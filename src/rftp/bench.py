@@ -6,7 +6,8 @@ import threading
 from dataclasses import dataclass
 from typing import BinaryIO, Literal, Union, cast
 
-from .constants import DEFAULT_SEGMENT_SIZE
+from . import packet
+from .constants import DEFAULT_SEGMENT_SIZE, DEFAULT_SOCK_BUF_BYTES
 from .net import Impairment, UdpEndpoint
 from .receiver import Receiver
 from .sender import GoBackNSender, StopAndWaitSender
@@ -30,11 +31,51 @@ def run_benchmark(
     segment_size: int = DEFAULT_SEGMENT_SIZE,
     window_size: int = 8,
     timeout_ms: int = 250,
+    checksum: bool = True,
+    sock_buf_bytes: int = DEFAULT_SOCK_BUF_BYTES,
+    busy_poll_us: int = 0,
+) -> BenchmarkResult:
+    prev_verify = packet.VERIFY_CHECKSUM
+    packet.VERIFY_CHECKSUM = checksum
+    try:
+        return _run_benchmark(
+            protocol=protocol,
+            size_bytes=size_bytes,
+            loss_rate=loss_rate,
+            delay_ms=delay_ms,
+            segment_size=segment_size,
+            window_size=window_size,
+            timeout_ms=timeout_ms,
+            sock_buf_bytes=sock_buf_bytes,
+            busy_poll_us=busy_poll_us,
+        )
+    finally:
+        packet.VERIFY_CHECKSUM = prev_verify
+
+
+def _run_benchmark(
+    *,
+    protocol: Literal["sw", "gbn"],
+    size_bytes: int,
+    loss_rate: float,
+    delay_ms: int,
+    segment_size: int,
+    window_size: int,
+    timeout_ms: int,
+    sock_buf_bytes: int,
+    busy_poll_us: int,
 ) -> BenchmarkResult:
     payload = b"A" * size_bytes
     impair = Impairment(loss_rate=loss_rate, delay_ms=delay_ms)
 
-    recv_ep = UdpEndpoint.listening("127.0.0.1", 0, timeout_ms=timeout_ms, impairment=impair)
+    recv_ep = UdpEndpoint.listening(
+        "127.0.0.1",
+        0,
+        timeout_ms=timeout_ms,
+        impairment=impair,
+        sock_buf_bytes=sock_buf_bytes,
+        busy_poll_us=busy_poll_us,
+    )
     recv_host, recv_port = recv_ep.sock.getsockname()
 
     out_file = tempfile.NamedTemporaryFile(delete=False)
@@ -51,7 +92,12 @@ def run_benchmark(
     t = threading.Thread(target=recv_runner, daemon=True)
     t.start()
 
-    send_ep = UdpEndpoint.sending(timeout_ms=timeout_ms, impairment=impair)
+    send_ep = UdpEndpoint.sending(
+        timeout_ms=timeout_ms,
+        impairment=impair,
+        sock_buf_bytes=sock_buf_bytes,
+        busy_poll_us=busy_poll_us,
+    )
     try:
         send_f = tempfile.TemporaryFile()
         send_f.write(payload)
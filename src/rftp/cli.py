@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import argparse
+import dataclasses
 import json
 from typing import Union
 
 from .bench import run_benchmark
-from .constants import DEFAULT_SEGMENT_SIZE, DEFAULT_TIMEOUT_MS
+from .constants import DEFAULT_SEGMENT_SIZE, DEFAULT_SOCK_BUF_BYTES, DEFAULT_TIMEOUT_MS
 from .net import Impairment, UdpEndpoint
 from .receiver import Receiver
 from .sender import GoBackNSender, StopAndWaitSender
@@ -18,6 +19,8 @@ def cmd_recv(args: argparse.Namespace) -> int:
         args.listen_port,
         timeout_ms=args.timeout_ms,
         impairment=impair,
+        sock_buf_bytes=args.sock_buf_bytes,
+        busy_poll_us=args.busy_poll_us,
     )
     with open(args.out, "wb") as out:
         metrics = Receiver(udp, out).run()
@@ -35,7 +38,12 @@ def cmd_recv(args: argparse.Namespace) -> int:
 
 def cmd_send(args: argparse.Namespace) -> int:
     impair = Impairment(args.loss_rate, args.delay_ms)
-    udp = UdpEndpoint.sending(timeout_ms=args.timeout_ms, impairment=impair)
+    udp = UdpEndpoint.sending(
+        timeout_ms=args.timeout_ms,
+        impairment=impair,
+        sock_buf_bytes=args.sock_buf_bytes,
+        busy_poll_us=args.busy_poll_us,
+    )
 
     with open(args.file, "rb") as f:
         if args.protocol == "sw":
@@ -45,6 +53,7 @@ def cmd_send(args: argparse.Namespace) -> int:
                 f,
                 segment_size=args.segment_size,
                 timeout_ms=args.timeout_ms,
+                connect_socket=args.connect_socket,
             )
         else:
             sender = GoBackNSender(
@@ -54,6 +63,7 @@ def cmd_send(args: argparse.Namespace) -> int:
                 window_size=args.window_size,
                 segment_size=args.segment_size,
                 timeout_ms=args.timeout_ms,
+                connect_socket=args.connect_socket,
             )
         metrics = sender.run()
 
@@ -80,8 +90,11 @@ def cmd_bench(args: argparse.Namespace) -> int:
         segment_size=args.segment_size,
         window_size=args.window_size,
         timeout_ms=args.timeout_ms,
+        checksum=not args.no_checksum,
+        sock_buf_bytes=args.sock_buf_bytes,
+        busy_poll_us=args.busy_poll_us,
     )
-    payload = {"role": "bench", **r.__dict__}
+    payload = {"role": "bench", **dataclasses.asdict(r)}
     print(json.dumps(payload, indent=2) if args.json else payload)
     return 0
 
@@ -95,6 +108,21 @@ def main(argv: list[str] | None = None) -> int:
         x.add_argument("--loss-rate", type=float, default=0.0)
         x.add_argument("--delay-ms", type=int, default=0)
         x.add_argument("--segment-size", type=int, default=DEFAULT_SEGMENT_SIZE)
+        x.add_argument(
+            "--sock-buf-bytes",
+            type=int,
+            default=DEFAULT_SOCK_BUF_BYTES,
+            help="SO_RCVBUF/SO_SNDBUF size request (0 keeps the kernel default)",
+        )
+        x.add_argument(
+            "--busy-poll-us",
+            type=int,
+            default=0,
+            help=(
+                "SO_BUSY_POLL window in microseconds (Linux; 0 = off); only takes effect "
+                "with the net.core.busy_poll sysctl set, since receives wait in poll()"
+            ),
+        )
         x.add_argument("--json", action="store_true")
 
     recv = sub.add_parser("recv")
@@ -111,6 +139,11 @@ def main(argv: list[str] | None = None) -> int:
     send.add_argument("--dest-host", required=True)
     send.add_argument("--dest-port", type=int, required=True)
     send.add_argument("--file", required=True)
+    send.add_argument(
+        "--connect-socket",
+        action="store_true",
+        help="connect() the UDP socket to the receiver (drops replies from other addresses)",
+    )
     send.set_defaults(func=cmd_send)
 
     bench = sub.add_parser("bench")
@@ -118,6 +151,11 @@ def main(argv: list[str] | None = None) -> int:
     bench.add_argument("--protocol", choices=["sw", "gbn"], default="gbn")
     bench.add_argument("--window-size", type=int, default=8)
     bench.add_argument("--size-bytes", type=int, default=5_000_000)
+    bench.add_argument(
+        "--no-checksum",
+        action="store_true",
+        help="skip per-frame CRC (loopback only; isolates the rest of the stack)",
+    )
     bench.set_defaults(func=cmd_bench)
 
     args = p.parse_args(argv)
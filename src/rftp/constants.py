@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-SHA1_LEN = 20
+CRC32_LEN = 4
 HEADER_FORMAT = "!BBHII"  # version, kind, flags, seq, ack
-VERSION = 1
+CHECKSUM_FORMAT = "!I"  # CRC32 over header + payload
+VERSION = 2
 
 DATA = 0
 ACK = 1
@@ -12,3 +13,4 @@ FLAG_FIN = 0x1
 DEFAULT_SEGMENT_SIZE = 1400
 DEFAULT_TIMEOUT_MS = 250
 DEFAULT_GBN_WINDOW = 8
+DEFAULT_SOCK_BUF_BYTES = 4 * 1024 * 1024
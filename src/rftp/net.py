@@ -1,10 +1,89 @@
 from __future__ import annotations
 
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
 import random
+import select
 import socket
+import struct
+import sys
 import time
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Any, Sequence, Tuple
+
+from .constants import DEFAULT_SOCK_BUF_BYTES
+
+# Upper bound on datagrams handed to a single sendmmsg(2)/recvmmsg(2); past ~64
+# the per-syscall savings flatten out while the ctypes arrays keep growing.
+MMSG_BATCH = 64
+MAX_DATAGRAM = 65535
+_SOCKADDR_IN_LEN = 16
+
+_log = logging.getLogger(__name__)
+
+# Linux >= 3.11; the socket module doesn't export the constant, so fall back to
+# its value from <asm-generic/socket.h>
+_SO_BUSY_POLL = getattr(socket, "SO_BUSY_POLL", 46 if sys.platform.startswith("linux") else None)
+
+# MSG_ZEROCOPY is deliberately not used: page pinning plus the MSG_ERRQUEUE
+# completion round trip only pays off for sends of roughly 10 KB and up
+# (see the kernel's msg_zerocopy docs), while our datagrams are MTU-sized.
+# Batching with sendmmsg is what removes the per-packet cost here.
+
+
+class _IoVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_char_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IoVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+def _load_libc(name: str, argtypes: list[Any]) -> Any:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fn = getattr(libc, name)
+    except (OSError, AttributeError):
+        return None
+    fn.argtypes = argtypes
+    fn.restype = ctypes.c_int
+    return fn
+
+
+_sendmmsg = _load_libc(
+    "sendmmsg", [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int]
+)
+_recvmmsg = _load_libc(
+    "recvmmsg", [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+)
+
+
+def _sockaddr_in(addr: Tuple[str, int]) -> bytes:
+    host, port = addr
+    ip = socket.inet_aton(socket.gethostbyname(host))
+    return struct.pack("=H", socket.AF_INET) + struct.pack("!H", port) + ip + bytes(8)
+
+
+def _from_sockaddr_in(raw: bytes) -> Tuple[str, int]:
+    (port,) = struct.unpack_from("!H", raw, 2)
+    return socket.inet_ntoa(raw[4:8]), port
 
 
 @dataclass(frozen=True, slots=True)
@@ -12,18 +91,168 @@ class Impairment:
     loss_rate: float = 0.0
     delay_ms: int = 0
 
+    @property
+    def clean(self) -> bool:
+        return self.loss_rate <= 0 and self.delay_ms <= 0
+
     def should_drop(self) -> bool:
-        return random.random() < self.loss_rate
+        return self.loss_rate > 0 and random.random() < self.loss_rate
 
     def sleep_if_needed(self) -> None:
         if self.delay_ms > 0:
             time.sleep(self.delay_ms / 1000.0)
 
 
+class _MMsgBatch:
+    """Preallocated mmsghdr/iovec arrays for sendmmsg(2) to one destination.
+
+    An empty ``sockaddr`` leaves msg_name NULL, for connected sockets.
+    """
+
+    def __init__(self, sockaddr: bytes):
+        self.name = ctypes.create_string_buffer(sockaddr, len(sockaddr))
+        self.iovs = (_IoVec * MMSG_BATCH)()
+        self.msgs = (_MMsgHdr * MMSG_BATCH)()
+        for i in range(MMSG_BATCH):
+            hdr = self.msgs[i].msg_hdr
+            if sockaddr:
+                hdr.msg_name = ctypes.addressof(self.name)
+                hdr.msg_namelen = len(sockaddr)
+            hdr.msg_iov = ctypes.pointer(self.iovs[i])
+            hdr.msg_iovlen = 1
+
+    def send(self, sock: socket.socket, datagrams: Sequence[bytes]) -> None:
+        assert _sendmmsg is not None
+        n = len(datagrams)
+        iovs = self.iovs
+        for i, data in enumerate(datagrams):
+            iovs[i].iov_base = data
+            iovs[i].iov_len = len(data)
+
+        fd = sock.fileno()
+        done = 0
+        while done < n:
+            first = ctypes.addressof(self.msgs) + done * ctypes.sizeof(_MMsgHdr)
+            sent = _sendmmsg(fd, first, n - done, 0)
+            if sent >= 0:
+                done += sent
+                continue
+            err = ctypes.get_errno()
+            if err in (errno.EINTR, errno.ECONNREFUSED):
+                # ECONNREFUSED is a stale ICMP error on a connected socket (see
+                # UdpEndpoint.send); reading it cleared it, so just retry
+                continue
+            if err in (errno.EAGAIN, errno.EWOULDBLOCK):
+                # sockets with a Python timeout are non-blocking at the fd level
+                _, writable, _ = select.select([], [fd], [], sock.gettimeout())
+                if not writable:
+                    raise TimeoutError("timed out")
+                continue
+            raise OSError(err, os.strerror(err))
+
+        for i in range(n):
+            iovs[i].iov_base = None
+
+
+class _RecvPool:
+    """Preallocated datagram slots and mmsghdr/iovec arrays for recvmmsg(2)."""
+
+    def __init__(self, count: int = MMSG_BATCH, slot_size: int = MAX_DATAGRAM):
+        self.count = count
+        self.slot_size = slot_size
+        self.slab = ctypes.create_string_buffer(count * slot_size)
+        self.names = ctypes.create_string_buffer(count * _SOCKADDR_IN_LEN)
+        self.slab_view = memoryview(self.slab).cast("B")
+        self.names_view = memoryview(self.names).cast("B")
+        self.iovs = (_IoVec * count)()
+        self.msgs = (_MMsgHdr * count)()
+        base = ctypes.addressof(self.slab)
+        names = ctypes.addressof(self.names)
+        for i in range(count):
+            self.iovs[i].iov_base = base + i * slot_size
+            self.iovs[i].iov_len = slot_size
+            hdr = self.msgs[i].msg_hdr
+            hdr.msg_name = names + i * _SOCKADDR_IN_LEN
+            hdr.msg_iov = ctypes.pointer(self.iovs[i])
+            hdr.msg_iovlen = 1
+        self._last_name = b""
+        self._last_addr: Tuple[str, int] = ("", 0)
+
+    def recv(self, sock: socket.socket) -> list[Tuple[bytes, Tuple[str, int]]]:
+        assert _recvmmsg is not None
+        fd = sock.fileno()
+        timeout = sock.gettimeout()
+        msgs = self.msgs
+        for i in range(self.count):
+            msgs[i].msg_hdr.msg_namelen = _SOCKADDR_IN_LEN
+
+        while True:
+            n = _recvmmsg(fd, ctypes.addressof(msgs), self.count, socket.MSG_DONTWAIT, None)
+            if n >= 0:
+                break
+            err = ctypes.get_errno()
+            if err == errno.EINTR:
+                continue
+            if err not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                raise OSError(err, os.strerror(err))
+            readable, _, _ = select.select([fd], [], [], timeout)
+            if not readable:
+                raise TimeoutError("timed out")
+
+        out = []
+        slab = self.slab_view
+        names = self.names_view
+        for i in range(n):
+            start = i * self.slot_size
+            data = bytes(slab[start : start + msgs[i].msg_len])
+            name = bytes(names[i * _SOCKADDR_IN_LEN : (i + 1) * _SOCKADDR_IN_LEN])
+            if name != self._last_name:
+                self._last_name = name
+                self._last_addr = _from_sockaddr_in(name)
+            out.append((data, self._last_addr))
+        return out
+
+
 class UdpEndpoint:
     def __init__(self, sock: socket.socket, impairment: Impairment | None = None):
         self.sock = sock
         self.impairment = impairment or Impairment()
+        # without impairment, skip the wrappers entirely on the hot paths
+        self._clean = self.impairment.clean
+        if self._clean:
+            self.sendto = sock.sendto  # type: ignore[method-assign, assignment]
+        self._batches: dict[Tuple[str, int] | None, _MMsgBatch] = {}
+        self.peer: Tuple[str, int] | None = None
+        self._connected = False
+        self._recv_pool: _RecvPool | None = None
+        self._poll: Any = None
+        if hasattr(select, "poll"):
+            poller = select.poll()
+            poller.register(sock, select.POLLIN)
+            self._poll = poller.poll
+
+    @staticmethod
+    def _new_socket(sock_buf_bytes: int, busy_poll_us: int = 0) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        if sock_buf_bytes > 0:
+            # the kernel default (~212 KiB on Linux) overflows as soon as the
+            # receiver falls briefly behind a large GBN window; the kernel caps
+            # these at net.core.{r,w}mem_max, so this is best effort
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, sock_buf_bytes)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, sock_buf_bytes)
+        if busy_poll_us > 0:
+            # marks the socket for busy polling. Every receive path here waits
+            # in poll()/select() first, and Linux only spins there when the
+            # net.core.busy_poll sysctl is non-zero too. Going above
+            # net.core.busy_read needs CAP_NET_ADMIN, so this is best effort
+            if _SO_BUSY_POLL is None:
+                _log.warning("SO_BUSY_POLL is not supported on %s; not busy polling", sys.platform)
+            else:
+                try:
+                    sock.setsockopt(socket.SOL_SOCKET, _SO_BUSY_POLL, busy_poll_us)
+                except OSError as exc:
+                    _log.warning("could not set SO_BUSY_POLL=%d: %s", busy_poll_us, exc)
+        return sock
 
     @classmethod
     def listening(
@@ -32,8 +261,10 @@ class UdpEndpoint:
         port: int,
         timeout_ms: int = 0,
         impairment: Impairment | None = None,
+        sock_buf_bytes: int = DEFAULT_SOCK_BUF_BYTES,
+        busy_poll_us: int = 0,
     ) -> "UdpEndpoint":
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock = cls._new_socket(sock_buf_bytes, busy_poll_us)
         sock.bind((host, port))
         if timeout_ms > 0:
             sock.settimeout(timeout_ms / 1000.0)
@@ -44,8 +275,10 @@ class UdpEndpoint:
         cls,
         timeout_ms: int = 0,
         impairment: Impairment | None = None,
+        sock_buf_bytes: int = DEFAULT_SOCK_BUF_BYTES,
+        busy_poll_us: int = 0,
     ) -> "UdpEndpoint":
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock = cls._new_socket(sock_buf_bytes, busy_poll_us)
         if timeout_ms > 0:
             sock.settimeout(timeout_ms / 1000.0)
         return cls(sock, impairment)
@@ -56,7 +289,62 @@ class UdpEndpoint:
         self.impairment.sleep_if_needed()
         self.sock.sendto(data, addr)
 
+    def set_peer(self, addr: Tuple[str, int]) -> None:
+        self.peer = addr
+
+    def connect(self, addr: Tuple[str, int]) -> None:
+        """``set_peer`` plus connect(2); the kernel then drops replies from any other address."""
+        self.sock.connect(addr)
+        self.peer = addr
+        self._connected = True
+
+    def send(self, data: bytes) -> None:
+        if not self._clean:
+            if self.impairment.should_drop():
+                return
+            self.impairment.sleep_if_needed()
+        if not self._connected:
+            self.sock.sendto(data, self.peer)  # type: ignore[arg-type]
+            return
+        try:
+            self.sock.send(data)
+        except ConnectionRefusedError:
+            # a connected UDP socket reports ICMP port-unreachable from an
+            # earlier datagram (peer not up yet, or already gone) on the next
+            # call; that consumed the error, so this datagram still goes out
+            self.sock.send(data)
+
+    def send_batch(
+        self, datagrams: Sequence[bytes], addr: Tuple[str, int] | None = None
+    ) -> None:
+        """Send to ``addr`` (default: the peer) with sendmmsg(2) where available."""
+        if addr is None and not self._connected:
+            addr = self.peer
+        if self._clean:
+            kept = datagrams
+        else:
+            kept = [d for d in datagrams if not self.impairment.should_drop()]
+            for _ in kept:
+                self.impairment.sleep_if_needed()
+
+        if len(kept) < 2 or _sendmmsg is None or self.sock.family != socket.AF_INET:
+            for data in kept:
+                if addr is None:
+                    self.send(data)
+                else:
+                    self.sock.sendto(data, addr)
+            return
+
+        batch = self._batches.get(addr)
+        if batch is None:
+            sockaddr = b"" if addr is None else _sockaddr_in(addr)
+            batch = self._batches[addr] = _MMsgBatch(sockaddr)
+        for i in range(0, len(kept), MMSG_BATCH):
+            batch.send(self.sock, kept[i : i + MMSG_BATCH])
+
     def recvfrom(self, bufsize: int = 65535) -> Tuple[bytes, Tuple[str, int]]:
+        if self._clean:
+            return self.sock.recvfrom(bufsize)
         while True:
             data, addr = self.sock.recvfrom(bufsize)
             if self.impairment.should_drop():
@@ -64,5 +352,53 @@ class UdpEndpoint:
             self.impairment.sleep_if_needed()
             return data, addr
 
+    def recv_into(self, buf: bytearray, blocking: bool = True) -> memoryview:
+        """Receive into ``buf``; empty on a stale ICMP error or impaired drop,
+        ``BlockingIOError`` on an empty queue when not ``blocking``."""
+        view = memoryview(buf)
+        # MSG_DONTWAIT is no use here: CPython waits out the socket timeout
+        # before every recv on a socket that has one
+        if not blocking and not self.wait_readable(0):
+            raise BlockingIOError(errno.EAGAIN, "no datagram queued")
+        try:
+            n = self.sock.recv_into(buf)
+        except ConnectionRefusedError:
+            return view[:0]
+        if not self._clean:
+            if self.impairment.should_drop():
+                return view[:0]
+            self.impairment.sleep_if_needed()
+        return view[:n]
+
+    def wait_readable(self, timeout_ms: float) -> bool:
+        """Wait up to ``timeout_ms`` for a datagram (or pending socket error)
+        without reading it; ``False`` means the wait ran out."""
+        if self._poll is not None:
+            return bool(self._poll(timeout_ms))
+        readable, _, _ = select.select([self.sock], [], [], timeout_ms / 1000.0)
+        return bool(readable)
+
+    def recv_batch(self) -> list[Tuple[bytes, Tuple[str, int]]]:
+        """Receive every queued datagram (at least one) with a single recvmmsg(2).
+
+        Blocks up to the socket timeout for the first datagram and raises
+        ``TimeoutError`` like ``recvfrom``. Falls back to one ``recvfrom`` per
+        call where recvmmsg is unavailable.
+        """
+        if _recvmmsg is None or self.sock.family != socket.AF_INET:
+            return [self.recvfrom()]
+
+        if self._recv_pool is None:
+            self._recv_pool = _RecvPool()
+        pool = self._recv_pool
+        if self._clean:
+            return pool.recv(self.sock)
+        while True:
+            batch = [d for d in pool.recv(self.sock) if not self.impairment.should_drop()]
+            if batch:
+                for _ in batch:
+                    self.impairment.sleep_if_needed()
+                return batch
+
     def close(self) -> None:
         self.sock.close()
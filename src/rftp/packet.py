@@ -1,11 +1,30 @@
 from __future__ import annotations
 
 import enum
-import hashlib
 import struct
+import zlib
 from dataclasses import dataclass
 
-from .constants import ACK, DATA, FLAG_FIN, HEADER_FORMAT, SHA1_LEN, VERSION
+from .constants import ACK, CHECKSUM_FORMAT, CRC32_LEN, DATA, FLAG_FIN, HEADER_FORMAT, VERSION
+
+_HDR = struct.Struct(HEADER_FORMAT)
+_CRC = struct.Struct(CHECKSUM_FORMAT)
+_PAYLOAD_OFFSET = _HDR.size + CRC32_LEN
+# header and checksum in one unpack, for the tuple fast path
+_HDR_CRC = struct.Struct(HEADER_FORMAT + CHECKSUM_FORMAT[1:])
+# ACK frames carry no payload, so every valid one is exactly this long
+_ACK_FRAME_LEN = _PAYLOAD_OFFSET
+
+# zlib.crc32 is the checksum primitive. Where the linked zlib is zlib-ng it uses
+# PCLMULQDQ folding (x86) or the ARMv8 CRC32 instructions; stock zlib's braided
+# table CRC is slower but still runs in C. Bound once so the hot paths skip the
+# module attribute lookup.
+_crc32 = zlib.crc32
+
+# Loopback benchmarks flip this off to measure the rest of the stack without
+# per-frame CRC work: frames then carry a zero checksum that is never checked.
+# Both peers must agree, so leave it on for anything that crosses a real link.
+VERIFY_CHECKSUM = True
 
 
 class PacketKind(enum.IntEnum):
@@ -13,6 +32,11 @@ class PacketKind(enum.IntEnum):
     ACK = ACK
 
 
+# PacketKind(value) goes through EnumMeta.__call__ on every parse; a plain dict
+# lookup gives the same members at a fraction of the cost
+_KIND_BY_VALUE = {int(k): k for k in PacketKind}
+
+
 @dataclass(frozen=True, slots=True)
 class Frame:
     version: int
@@ -27,47 +51,97 @@ class Frame:
         return bool(self.flags & FLAG_FIN)
 
     def to_bytes(self) -> bytes:
-        header = struct.pack(
-            HEADER_FORMAT,
+        header = _HDR.pack(
             self.version,
             int(self.kind),
             self.flags,
             self.seq,
             self.ack,
         )
-        checksum = hashlib.sha1(header + self.payload).digest()
+        crc = _crc32(self.payload, _crc32(header)) if VERIFY_CHECKSUM else 0
+        checksum = _CRC.pack(crc)
         return header + checksum + self.payload
 
     @staticmethod
-    def from_bytes(raw: bytes) -> "Frame":
-        header_len = struct.calcsize(HEADER_FORMAT)
-        if len(raw) < header_len + SHA1_LEN:
+    def from_bytes(raw: bytes | memoryview) -> "Frame":
+        if len(raw) < _PAYLOAD_OFFSET:
             raise ValueError("datagram too small to be a valid frame")
 
-        header = raw[:header_len]
-        checksum = raw[header_len : header_len + SHA1_LEN]
-        payload = raw[header_len + SHA1_LEN :]
+        (checksum,) = _CRC.unpack_from(raw, _HDR.size)
+        # checked through a view; only a valid frame pays for the bytes copy.
+        # parse_header_fast hands out the view itself for zero-copy callers
+        view = memoryview(raw)[_PAYLOAD_OFFSET:]
 
-        if hashlib.sha1(header + payload).digest() != checksum:
+        if VERIFY_CHECKSUM and _crc32(view, _crc32(raw[: _HDR.size])) != checksum:
             raise ValueError("checksum mismatch")
 
-        version, kind, flags, seq, ack = struct.unpack(HEADER_FORMAT, header)
+        version, kind_value, flags, seq, ack = _HDR.unpack_from(raw, 0)
         if version != VERSION:
             raise ValueError(f"version mismatch: expected {VERSION}, got {version}")
+        kind = _KIND_BY_VALUE.get(kind_value)
+        if kind is None:
+            raise ValueError(f"unknown frame kind: {kind_value}")
 
         return Frame(
             version=version,
-            kind=PacketKind(kind),
+            kind=kind,
             flags=flags,
             seq=seq,
             ack=ack,
-            payload=payload,
+            payload=bytes(view),
         )
 
+    @staticmethod
+    def parse_header_fast(raw: bytes | memoryview) -> tuple[int, int, int, memoryview]:
+        """Validate ``raw`` exactly like ``from_bytes`` but return a plain
+        ``(kind, flags, seq, payload)`` tuple instead of building a ``Frame``.
+
+        For the receiver's per-datagram loop; ``kind`` is the raw wire value.
+        """
+        if len(raw) < _PAYLOAD_OFFSET:
+            raise ValueError("datagram too small to be a valid frame")
+        version, kind, flags, seq, _ack, checksum = _HDR_CRC.unpack_from(raw, 0)
+        payload = memoryview(raw)[_PAYLOAD_OFFSET:]
+        if VERIFY_CHECKSUM and _crc32(payload, _crc32(raw[: _HDR.size])) != checksum:
+            raise ValueError("checksum mismatch")
+        if version != VERSION:
+            raise ValueError(f"version mismatch: expected {VERSION}, got {version}")
+        if kind not in _KIND_BY_VALUE:
+            raise ValueError(f"unknown frame kind: {kind}")
+        return kind, flags, seq, payload
+
+    @staticmethod
+    def parse_ack(raw: bytes | memoryview) -> int:
+        """Validate ``raw`` as an ACK frame and return just its ack number,
+        without building a ``Frame``; raises ``ValueError`` like ``from_bytes``."""
+        if len(raw) != _ACK_FRAME_LEN:
+            raise ValueError(f"ACK frame must be {_ACK_FRAME_LEN} bytes, got {len(raw)}")
+        version, kind, _flags, _seq, ack, checksum = _HDR_CRC.unpack_from(raw, 0)
+        if VERIFY_CHECKSUM and _crc32(raw[: _HDR.size]) != checksum:
+            raise ValueError("checksum mismatch")
+        if version != VERSION:
+            raise ValueError(f"version mismatch: expected {VERSION}, got {version}")
+        if kind != ACK:
+            raise ValueError(f"expected an ACK frame, got kind {kind}")
+        return int(ack)
+
     @staticmethod
     def make_ack(ack_num: int) -> "Frame":
         return Frame(version=VERSION, kind=PacketKind.ACK, flags=0, seq=0, ack=ack_num)
 
+    @staticmethod
+    def ack_bytes(ack_num: int) -> bytes:
+        """Serialized ``make_ack(ack_num)``, packed directly without a ``Frame``."""
+        header = _HDR.pack(VERSION, ACK, 0, 0, ack_num)
+        return header + _CRC.pack(_crc32(header) if VERIFY_CHECKSUM else 0)
+
+    @staticmethod
+    def data_bytes(seq: int, payload: bytes | memoryview, fin: bool = False) -> bytes:
+        """Serialized ``data(seq, payload, fin=fin)``, packed directly without a ``Frame``."""
+        header = _HDR.pack(VERSION, DATA, FLAG_FIN if fin else 0, seq, 0)
+        crc = _crc32(payload, _crc32(header)) if VERIFY_CHECKSUM else 0
+        return header + _CRC.pack(crc) + payload
+
     @staticmethod
     def data(seq: int, payload: bytes, ack: int = 0, fin: bool = False) -> "Frame":
         flags = FLAG_FIN if fin else 0
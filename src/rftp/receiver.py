@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import os
 import time
-from dataclasses import dataclass
-from typing import BinaryIO
+from dataclasses import dataclass, field
+from typing import BinaryIO, Sequence
 
+from .constants import DATA, FLAG_FIN
 from .net import UdpEndpoint
 from .packet import Frame
 
@@ -14,7 +16,8 @@ class Metrics:
     bytes_sent: int = 0
     timeouts: int = 0
     retransmits: int = 0
-    start_ts: float = time.monotonic()
+    # per instance: a plain default would be evaluated once, at import
+    start_ts: float = field(default_factory=time.monotonic)
     end_ts: float | None = None
 
     @property
@@ -30,6 +33,32 @@ class Metrics:
         return (self.bytes_sent * 8 / 1_000_000) / self.duration_s
 
 
+# most buffers handed to one writev(); well under IOV_MAX (1024 on Linux)
+WRITEV_MAX_CHUNKS = 256
+
+
+def _writev_all(fd: int, chunks: Sequence[bytes | memoryview]) -> None:
+    pending = [memoryview(c) for c in chunks]
+    while pending:
+        written = os.writev(fd, pending[:WRITEV_MAX_CHUNKS])
+        while pending and written >= len(pending[0]):
+            written -= len(pending.pop(0))
+        if written:
+            pending[0] = pending[0][written:]
+
+
+def _raw_fd(out: BinaryIO) -> int | None:
+    if not hasattr(os, "writev"):
+        return None
+    try:
+        fd = out.fileno()
+    except (AttributeError, OSError):
+        return None
+    # anything already buffered must land before we bypass the buffer
+    out.flush()
+    return fd
+
+
 @dataclass(slots=True)
 class Receiver:
     udp: UdpEndpoint
@@ -38,28 +67,71 @@ class Receiver:
     def run(self) -> Metrics:
         metrics = Metrics()
         expected = 0
+        # with a real file behind `out`, a batch's in-order payloads are queued
+        # as views and handed to the kernel in one writev() instead of being
+        # copied through the BufferedWriter
+        fd = _raw_fd(self.out)
+        pending: list[bytes | memoryview] = []
+        # duplicate ACKs (loss, reordering) repeat the last value; `expected`
+        # never goes backwards, so one cached entry is all that can ever hit
+        last_ack_num = -1
+        last_ack = b""
 
-        while True:
-            raw, addr = self.udp.recvfrom()
+        recv_batch = self.udp.recv_batch
+        sendto = self.udp.sendto
+        write = self.out.write
+        parse_header_fast = Frame.parse_header_fast
+        ack_bytes = Frame.ack_bytes
+        packets_sent = bytes_sent = 0
+
+        done = False
+
+        while not done:
             try:
-                frame = Frame.from_bytes(raw)
-            except ValueError:
+                batch = recv_batch()
+            except TimeoutError:
                 continue
 
-            if frame.kind != frame.kind.DATA:
-                continue
+            # one cumulative ACK per batch: in-order bursts only move `expected`,
+            # out-of-order/duplicate frames still get a (single) duplicate ACK
+            ack_to = None
+            for raw, addr in batch:
+                try:
+                    kind, flags, seq, payload = parse_header_fast(raw)
+                except ValueError:
+                    continue
+
+                if kind != DATA:
+                    continue
+
+                if seq == expected:
+                    if fd is None:
+                        write(payload)
+                    elif payload:
+                        pending.append(payload)
+                    expected += 1
+                    bytes_sent += len(payload)
+                ack_to = addr
 
-            if frame.seq == expected:
-                self.out.write(frame.payload)
-                expected += 1
-                metrics.bytes_sent += len(frame.payload)
+                if flags & FLAG_FIN and seq < expected:
+                    done = True
+                    break
 
-            self.udp.sendto(Frame.make_ack(expected).to_bytes(), addr)
-            metrics.packets_sent += 1
+            # write before ACKing: an ACKed frame must already be in the file,
+            # and a write error must stop us before the sender moves on
+            if fd is not None and pending:
+                _writev_all(fd, pending)
+                pending.clear()
 
-            if frame.fin and frame.seq < expected:
-                break
+            if ack_to is not None:
+                if expected != last_ack_num:
+                    last_ack_num = expected
+                    last_ack = ack_bytes(expected)
+                sendto(last_ack, ack_to)
+                packets_sent += 1
 
         self.out.flush()
+        metrics.packets_sent = packets_sent
+        metrics.bytes_sent = bytes_sent
         metrics.end_ts = time.monotonic()
         return metrics
@@ -1,14 +1,115 @@
 from __future__ import annotations
 
+import mmap
+import os
 import time
+from collections import deque
 from dataclasses import dataclass
-from typing import BinaryIO, Tuple
+from typing import BinaryIO, Callable, Iterator, Tuple
 
 from .constants import DEFAULT_GBN_WINDOW, DEFAULT_SEGMENT_SIZE, DEFAULT_TIMEOUT_MS
 from .net import UdpEndpoint
 from .packet import Frame
 from .receiver import Metrics
 
+# senders only ever expect ACK frames back; anything longer is truncated and
+# then fails parse_ack's length check, same as any other garbage datagram
+ACK_BUF_SIZE = 2048
+
+# seekable inputs with at most this much left are serialized in full before the
+# first send, so the protocol loops only send and receive
+PRESERIALIZE_MAX_BYTES = 64 * 1024 * 1024
+
+# (wire bytes, payload length, fin) for each frame, in sequence order
+_WireFrame = Tuple[bytes, int, bool]
+
+
+class _SegmentReader:
+    """``f.read(segment_size)`` chunks, sliced from an mmap where ``f`` allows it."""
+
+    def __init__(self, f: BinaryIO, segment_size: int):
+        self.f = f
+        self.segment_size = segment_size
+        self._mm: mmap.mmap | None = None
+        self._view: memoryview | None = None
+        self._chunk: memoryview | None = None
+        self._offset = 0
+        try:
+            fd = f.fileno()
+            offset = f.tell()
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError):
+            return
+        self._mm = mm
+        self._view = memoryview(mm)
+        self._offset = offset
+
+    def read(self) -> bytes | memoryview:
+        if self._chunk is not None:
+            self._chunk.release()
+            self._chunk = None
+        view = self._view
+        if view is not None:
+            if self._offset < len(view):
+                chunk = self._chunk = view[self._offset : self._offset + self.segment_size]
+                self._offset += len(chunk)
+                return chunk
+            self.close()
+        return self.f.read(self.segment_size)
+
+    def close(self) -> None:
+        if self._chunk is not None:
+            self._chunk.release()
+            self._chunk = None
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+            self.f.seek(self._offset)
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+
+def _stream_frames(reader: _SegmentReader) -> Iterator[_WireFrame]:
+    read = reader.read
+    data_bytes = Frame.data_bytes
+    seq = 0
+    while True:
+        chunk = read()
+        if not chunk:
+            yield data_bytes(seq, b"", True), 0, True
+            return
+        yield data_bytes(seq, chunk), len(chunk), False
+        seq += 1
+
+
+def _remaining_bytes(f: BinaryIO) -> int | None:
+    try:
+        if not f.seekable():
+            return None
+        pos = f.tell()
+        end = f.seek(0, os.SEEK_END)
+        f.seek(pos)
+    except (AttributeError, OSError):
+        return None
+    return end - pos
+
+
+def _frame_source(
+    reader: _SegmentReader, preserialize_max_bytes: int
+) -> Callable[[], _WireFrame]:
+    """Return a callable producing the frames for ``reader`` one at a time, FIN
+    last.
+
+    Small seekable inputs are serialized up front; anything else is read and
+    serialized per call.
+    """
+    frames = _stream_frames(reader)
+    remaining = _remaining_bytes(reader.f)
+    if remaining is not None and remaining <= preserialize_max_bytes:
+        return iter(list(frames)).__next__
+    return frames.__next__
+
 
 @dataclass(slots=True)
 class StopAndWaitSender:
@@ -17,46 +118,87 @@ class StopAndWaitSender:
     f: BinaryIO
     segment_size: int = DEFAULT_SEGMENT_SIZE
     timeout_ms: int = DEFAULT_TIMEOUT_MS
+    preserialize_max_bytes: int = PRESERIALIZE_MAX_BYTES
+    connect_socket: bool = False
 
     def run(self) -> Metrics:
+        reader = _SegmentReader(self.f, self.segment_size)
+        try:
+            return self._run(reader)
+        finally:
+            reader.close()
+
+    def _run(self, reader: _SegmentReader) -> Metrics:
         metrics = Metrics()
         seq = 0
+        ack_buf = bytearray(ACK_BUF_SIZE)
+        if self.connect_socket:
+            self.udp.connect(self.dest)
+        else:
+            self.udp.set_peer(self.dest)
+
+        send = self.udp.send
+        recv_into = self.udp.recv_into
+        wait_readable = self.udp.wait_readable
+        monotonic_ns = time.monotonic_ns
+        timeout_ns = self.timeout_ms * 1_000_000
+        next_frame = _frame_source(reader, self.preserialize_max_bytes)
+        parse_ack = Frame.parse_ack
+        packets_sent = bytes_sent = timeouts = retransmits = 0
+        # next frame, read and serialized while the current one is in flight
+        # so that work overlaps the RTT instead of adding to it
+        ahead: _WireFrame | None = None
 
         while True:
-            chunk = self.f.read(self.segment_size)
-            fin = chunk == b""
-            payload = chunk or b""
-            frame = Frame.data(seq=seq, payload=payload, fin=fin)
+            raw_frame, size, fin = ahead if ahead is not None else next_frame()
+            ahead = None
 
             while True:
-                metrics.packets_sent += 1
-                metrics.bytes_sent += len(payload)
-                self.udp.sendto(frame.to_bytes(), self.dest)
+                packets_sent += 1
+                bytes_sent += size
+                send(raw_frame)
+                if ahead is None and not fin:
+                    ahead = next_frame()
 
-                try:
-                    raw, _ = self.udp.recvfrom()
-                except TimeoutError:
-                    metrics.timeouts += 1
-                    metrics.retransmits += 1
+                # wait out the rest of the RTO: a read that yields nothing
+                # (stale ICMP error, impaired drop) doesn't end the wait early.
+                # timeout_ms <= 0 means no RTO, like a 0 socket timeout
+                deadline_ns = monotonic_ns() + timeout_ns
+                while True:
+                    if timeout_ns > 0:
+                        remain_ns = deadline_ns - monotonic_ns()
+                        if remain_ns <= 0 or not wait_readable(remain_ns / 1_000_000):
+                            raw = None
+                            break
+                    try:
+                        raw = recv_into(ack_buf)
+                    except TimeoutError:
+                        continue
+                    if raw:
+                        break
+                if raw is None:
+                    timeouts += 1
+                    retransmits += 1
                     continue
 
                 try:
-                    ack = Frame.from_bytes(raw)
+                    ack_num = parse_ack(raw)
                 except ValueError:
                     continue
 
-                if ack.kind != ack.kind.ACK:
-                    continue
-
-                if ack.ack == seq + 1:
+                if ack_num == seq + 1:
                     seq += 1
                     break
 
-                metrics.retransmits += 1
+                retransmits += 1
 
             if fin:
                 break
 
+        metrics.packets_sent = packets_sent
+        metrics.bytes_sent = bytes_sent
+        metrics.timeouts = timeouts
+        metrics.retransmits = retransmits
         metrics.end_ts = time.monotonic()
         return metrics
 
@@ -69,70 +211,112 @@ class GoBackNSender:
     window_size: int = DEFAULT_GBN_WINDOW
     segment_size: int = DEFAULT_SEGMENT_SIZE
     timeout_ms: int = DEFAULT_TIMEOUT_MS
+    preserialize_max_bytes: int = PRESERIALIZE_MAX_BYTES
+    connect_socket: bool = False
 
     def run(self) -> Metrics:
+        reader = _SegmentReader(self.f, self.segment_size)
+        try:
+            return self._run(reader)
+        finally:
+            reader.close()
+
+    def _run(self, reader: _SegmentReader) -> Metrics:
         metrics = Metrics()
         base = 0
         next_seq = 0
-        buffer: dict[int, Frame] = {}
-        timer_start: float | None = None
+        # wire bytes of the unacked frames base..next_seq-1, oldest first,
+        # serialized (and checksummed) once on load so retransmits are a pure
+        # resend; a cumulative ACK just pops the acked prefix off the left
+        buffer: deque[bytes] = deque()
+        # integer nanoseconds: no float round-trip or ms conversion per check
+        monotonic_ns = time.monotonic_ns
+        timeout_ns = self.timeout_ms * 1_000_000
+        timer_start_ns: int | None = None
         eof_scheduled = False
+        ack_buf = bytearray(ACK_BUF_SIZE)
+        if self.connect_socket:
+            self.udp.connect(self.dest)
+        else:
+            self.udp.set_peer(self.dest)
 
-        def load_frame(seq: int) -> Frame:
-            nonlocal eof_scheduled
-            if seq in buffer:
-                return buffer[seq]
-            chunk = self.f.read(self.segment_size)
-            fin = chunk == b""
-            payload = chunk or b""
-            fr = Frame.data(seq=seq, payload=payload, fin=fin)
-            buffer[seq] = fr
-            if fin:
-                eof_scheduled = True
-            return fr
+        send_batch = self.udp.send_batch
+        recv_into = self.udp.recv_into
+        wait_readable = self.udp.wait_readable
+        next_frame = _frame_source(reader, self.preserialize_max_bytes)
+        window_size = self.window_size
+        parse_ack = Frame.parse_ack
+        packets_sent = bytes_sent = timeouts = retransmits = 0
+        # one frame past the window, prepared after each send so the fill that
+        # follows the next ACK never waits on the disk
+        ahead: _WireFrame | None = None
 
         while True:
-            while next_seq < base + self.window_size:
-                fr = load_frame(next_seq)
-                metrics.packets_sent += 1
-                metrics.bytes_sent += len(fr.payload)
-                self.udp.sendto(fr.to_bytes(), self.dest)
-                if timer_start is None:
-                    timer_start = time.monotonic()
+            window: list[bytes] = []
+            while next_seq < base + window_size and not eof_scheduled:
+                raw_frame, size, fin = ahead if ahead is not None else next_frame()
+                ahead = None
+                buffer.append(raw_frame)
+                if fin:
+                    eof_scheduled = True
+                packets_sent += 1
+                bytes_sent += size
+                window.append(raw_frame)
                 next_seq += 1
-                if fr.fin:
-                    break
+            if window:
+                send_batch(window)
+                if timer_start_ns is None:
+                    timer_start_ns = monotonic_ns()
+            if ahead is None and not eof_scheduled:
+                ahead = next_frame()
 
-            try:
-                raw, _ = self.udp.recvfrom()
-            except TimeoutError:
-                if timer_start is not None:
-                    elapsed_ms = (time.monotonic() - timer_start) * 1000
-                    if elapsed_ms >= self.timeout_ms:
-                        metrics.timeouts += 1
-                        metrics.retransmits += (next_seq - base)
-                        for s in range(base, next_seq):
-                            self.udp.sendto(buffer[s].to_bytes(), self.dest)
-                        timer_start = time.monotonic()
-                continue
+            # sleep exactly until the retransmission deadline: an empty wait
+            # *is* the timeout, so there's no early wakeup to re-check.
+            # timeout_ms <= 0 means no RTO, like a 0 socket timeout
+            if timer_start_ns is not None and timeout_ns > 0:
+                remain_ns = timeout_ns - (monotonic_ns() - timer_start_ns)
+                if remain_ns <= 0 or not wait_readable(remain_ns / 1_000_000):
+                    timeouts += 1
+                    retransmits += next_seq - base
+                    send_batch(list(buffer))
+                    timer_start_ns = monotonic_ns()
+                    continue
 
             try:
-                ack = Frame.from_bytes(raw)
-            except ValueError:
+                raw = recv_into(ack_buf)
+            except TimeoutError:
+                # only reachable without an RTO deadline to wait on
                 continue
 
-            if ack.kind != ack.kind.ACK:
-                continue
+            # then drain whatever else is already queued; ACKs are
+            # cumulative, so only the highest counts and the window slides
+            # (and refills) once per wakeup
+            acked = base
+            while True:
+                try:
+                    ack_num = parse_ack(raw)
+                except ValueError:
+                    pass
+                else:
+                    if acked < ack_num <= next_seq:
+                        acked = ack_num
+                try:
+                    raw = recv_into(ack_buf, False)
+                except BlockingIOError:
+                    break
 
-            if ack.ack > base:
-                base = ack.ack
-                for k in list(buffer.keys()):
-                    if k < base:
-                        del buffer[k]
-                timer_start = time.monotonic() if base != next_seq else None
+            if acked != base:
+                for _ in range(acked - base):
+                    buffer.popleft()
+                base = acked
+                timer_start_ns = monotonic_ns() if base != next_seq else None
 
             if eof_scheduled and base == next_seq:
                 break
 
+        metrics.packets_sent = packets_sent
+        metrics.bytes_sent = bytes_sent
+        metrics.timeouts = timeouts
+        metrics.retransmits = retransmits
         metrics.end_ts = time.monotonic()
         return metrics
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+from rftp import net
+from rftp.net import MMSG_BATCH, Impairment, UdpEndpoint
+
+
+def test_send_batch_delivers_every_datagram_in_order():
+    recv = UdpEndpoint.listening("127.0.0.1", 0, timeout_ms=1000)
+    send = UdpEndpoint.sending(timeout_ms=1000)
+    try:
+        datagrams = [i.to_bytes(4, "big") * 8 for i in range(MMSG_BATCH + 5)]
+        send.send_batch(datagrams, recv.sock.getsockname())
+        got = [recv.recvfrom()[0] for _ in datagrams]
+        assert got == datagrams
+    finally:
+        send.close()
+        recv.close()
+
+
+def test_recv_batch_drains_queued_datagrams():
+    recv = UdpEndpoint.listening("127.0.0.1", 0, timeout_ms=1000)
+    send = UdpEndpoint.sending(timeout_ms=1000)
+    try:
+        addr = recv.sock.getsockname()
+        datagrams = [bytes([i]) * (i + 1) for i in range(10)]
+        for d in datagrams:
+            send.sendto(d, addr)
+
+        got: list[bytes] = []
+        while len(got) < len(datagrams):
+            for data, peer in recv.recv_batch():
+                assert peer == ("127.0.0.1", send.sock.getsockname()[1])
+                got.append(data)
+        assert got == datagrams
+    finally:
+        send.close()
+        recv.close()
+
+
+def test_recv_batch_times_out():
+    recv = UdpEndpoint.listening("127.0.0.1", 0, timeout_ms=50)
+    try:
+        with pytest.raises(TimeoutError):
+            recv.recv_batch()
+    finally:
+        recv.close()
+
+
+def test_clean_endpoint_sends_through_the_socket_directly():
+    send = UdpEndpoint.sending()
+    lossy = UdpEndpoint.sending(impairment=Impairment(loss_rate=0.5))
+    try:
+        assert send.sendto == send.sock.sendto
+        assert lossy.sendto != lossy.sock.sendto
+    finally:
+        send.close()
+        lossy.close()
+
+
+def test_wait_readable_reports_queued_datagram_without_reading_it():
+    recv = UdpEndpoint.listening("127.0.0.1", 0, timeout_ms=1000)
+    send = UdpEndpoint.sending(timeout_ms=1000)
+    try:
+        assert not recv.wait_readable(20)
+        send.sendto(b"ping", recv.sock.getsockname())
+        assert recv.wait_readable(1000)
+        assert recv.recvfrom()[0] == b"ping"
+    finally:
+        send.close()
+        recv.close()
+
+
+def test_recv_into_returns_empty_view_on_impaired_drop():
+    recv = UdpEndpoint.listening(
+        "127.0.0.1", 0, timeout_ms=1000, impairment=Impairment(loss_rate=1.0)
+    )
+    send = UdpEndpoint.sending(timeout_ms=1000)
+    try:
+        send.sendto(b"lost", recv.sock.getsockname())
+        assert recv.wait_readable(1000)
+        assert len(recv.recv_into(bytearray(64))) == 0
+        # and control came back without consuming a second datagram
+        assert not recv.wait_readable(0)
+    finally:
+        send.close()
+        recv.close()
+
+
+def test_nonblocking_recv_into_raises_on_empty_queue():
+    recv = UdpEndpoint.listening("127.0.0.1", 0, timeout_ms=1000)
+    send = UdpEndpoint.sending(timeout_ms=1000)
+    try:
+        with pytest.raises(BlockingIOError):
+            recv.recv_into(bytearray(64), blocking=False)
+        send.sendto(b"ping", recv.sock.getsockname())
+        assert recv.wait_readable(1000)
+        assert bytes(recv.recv_into(bytearray(64), blocking=False)) == b"ping"
+    finally:
+        send.close()
+        recv.close()
+
+
+def test_busy_poll_failure_is_logged(monkeypatch, caplog):
+    # an option number no kernel knows makes setsockopt fail like EPERM would
+    monkeypatch.setattr(net, "_SO_BUSY_POLL", 0x7FFF)
+    with caplog.at_level(logging.WARNING, logger="rftp.net"):
+        UdpEndpoint.sending(busy_poll_us=50).close()
+    assert "SO_BUSY_POLL" in caplog.text
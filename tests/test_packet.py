@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import struct
+import zlib
+
 import pytest
 
-from rftp.packet import Frame
+from rftp import packet
+from rftp.constants import CRC32_LEN, HEADER_FORMAT, VERSION
+from rftp.packet import Frame, PacketKind
 
 
 def test_roundtrip_data():
@@ -28,3 +33,74 @@ def test_bad_checksum():
     raw[-1] ^= 0xFF
     with pytest.raises(ValueError):
         Frame.from_bytes(bytes(raw))
+
+
+def test_checksum_is_crc32():
+    f = Frame.data(seq=3, payload=b"abc")
+    raw = f.to_bytes()
+    assert len(raw) == struct.calcsize(HEADER_FORMAT) + CRC32_LEN + 3
+    header_len = struct.calcsize(HEADER_FORMAT)
+    (checksum,) = struct.unpack("!I", raw[header_len : header_len + CRC32_LEN])
+    assert checksum == zlib.crc32(raw[:header_len] + b"abc")
+
+
+def test_unknown_kind_rejected():
+    raw = Frame(version=VERSION, kind=PacketKind.DATA, flags=0, seq=0, ack=0).to_bytes()
+    header = bytearray(raw[: struct.calcsize(HEADER_FORMAT)])
+    header[1] = 0x7F
+    checksum = struct.pack("!I", zlib.crc32(bytes(header)))
+    with pytest.raises(ValueError, match="unknown frame kind"):
+        Frame.from_bytes(bytes(header) + checksum)
+
+
+def test_checksum_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(packet, "VERIFY_CHECKSUM", False)
+    raw = bytearray(Frame.data(seq=2, payload=b"x").to_bytes())
+    assert raw[struct.calcsize(HEADER_FORMAT) : struct.calcsize(HEADER_FORMAT) + CRC32_LEN] == (
+        b"\x00" * CRC32_LEN
+    )
+    raw[-1] ^= 0xFF
+    assert Frame.from_bytes(bytes(raw)).payload == bytes([ord("x") ^ 0xFF])
+
+
+def test_parse_header_fast_matches_from_bytes():
+    raw = Frame.data(seq=9, payload=b"payload", fin=True).to_bytes()
+    f = Frame.from_bytes(raw)
+    kind, flags, seq, payload = Frame.parse_header_fast(raw)
+    assert (kind, flags, seq, bytes(payload)) == (int(f.kind), f.flags, f.seq, b"payload")
+
+    bad = bytearray(raw)
+    bad[-1] ^= 0xFF
+    with pytest.raises(ValueError):
+        Frame.parse_header_fast(bytes(bad))
+
+
+def test_ack_bytes_matches_make_ack():
+    for n in (0, 1, 2**32 - 1):
+        assert Frame.ack_bytes(n) == Frame.make_ack(n).to_bytes()
+
+
+def test_data_bytes_matches_data():
+    cases = ((0, b"hello", False), (7, b"", True), (2**32 - 1, b"x" * 1400, False))
+    for seq, payload, fin in cases:
+        assert Frame.data_bytes(seq, payload, fin) == Frame.data(seq, payload, fin=fin).to_bytes()
+
+
+def test_parse_ack_matches_from_bytes():
+    raw = Frame.ack_bytes(42)
+    assert Frame.parse_ack(raw) == Frame.from_bytes(raw).ack == 42
+
+    with pytest.raises(ValueError):
+        Frame.parse_ack(raw[:-1] + bytes([raw[-1] ^ 0xFF]))
+    with pytest.raises(ValueError):
+        Frame.parse_ack(Frame.data_bytes(0, b""))
+    with pytest.raises(ValueError):
+        Frame.parse_ack(Frame.data_bytes(0, b"abc"))
+
+
+def test_from_bytes_payload_is_bytes():
+    raw = Frame.data_bytes(3, b"hello")
+    p = Frame.from_bytes(memoryview(raw))
+    assert type(p.payload) is bytes
+    assert p.payload.decode() == "hello"
+    assert isinstance(Frame.parse_header_fast(raw)[3], memoryview)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import io
+import os
+import threading
+
+import pytest
+
+from rftp.net import UdpEndpoint
+from rftp.packet import Frame
+from rftp.receiver import Receiver
+from rftp.sender import GoBackNSender, StopAndWaitSender, _SegmentReader
+
+
+def _transfer(
+    protocol,
+    data,
+    out,
+    src=None,
+    listen_host="127.0.0.1",
+    dest_host=None,
+    send_timeout_ms=250,
+    **sender_kwargs,
+):
+    src = io.BytesIO(data) if src is None else src
+    recv_ep = UdpEndpoint.listening(listen_host, 0, timeout_ms=250)
+    t = threading.Thread(target=Receiver(recv_ep, out).run, daemon=True)
+    t.start()
+
+    send_ep = UdpEndpoint.sending(timeout_ms=send_timeout_ms)
+    host, port = recv_ep.sock.getsockname()
+    dest = (dest_host or host, port)
+    try:
+        if protocol == "sw":
+            metrics = StopAndWaitSender(send_ep, dest, src, **sender_kwargs).run()
+        else:
+            metrics = GoBackNSender(send_ep, dest, src, window_size=16, **sender_kwargs).run()
+    finally:
+        send_ep.close()
+    t.join(timeout=5.0)
+    recv_ep.close()
+
+    assert not t.is_alive()
+    assert metrics.bytes_sent == len(data)
+
+
+@pytest.mark.parametrize("protocol", ["sw", "gbn"])
+@pytest.mark.parametrize("preserialize_max_bytes", [0, 1 << 20])
+def test_loopback_transfer_is_byte_exact(protocol, preserialize_max_bytes):
+    data = os.urandom(50_000)
+    out = io.BytesIO()
+    _transfer(protocol, data, out, preserialize_max_bytes=preserialize_max_bytes)
+    assert out.getvalue() == data
+
+
+@pytest.mark.parametrize("protocol", ["sw", "gbn"])
+def test_zero_timeout_means_no_rto(protocol):
+    data = os.urandom(20_000)
+    out = io.BytesIO()
+    _transfer(protocol, data, out, send_timeout_ms=0, timeout_ms=0)
+    assert out.getvalue() == data
+
+
+@pytest.mark.parametrize("protocol", ["sw", "gbn"])
+def test_connected_sender_transfer_is_byte_exact(protocol):
+    data = os.urandom(50_000)
+    out = io.BytesIO()
+    _transfer(protocol, data, out, connect_socket=True)
+    assert out.getvalue() == data
+
+
+@pytest.mark.parametrize("protocol", ["sw", "gbn"])
+def test_sender_accepts_acks_from_another_receiver_address(protocol):
+    # a wildcard-bound receiver answers 127.0.0.2 from 127.0.0.1; an
+    # unconnected sender must still take those ACKs
+    data = os.urandom(50_000)
+    out = io.BytesIO()
+    _transfer(protocol, data, out, listen_host="0.0.0.0", dest_host="127.0.0.2")
+    assert out.getvalue() == data
+
+
+def test_receiver_writes_real_file(tmp_path):
+    # large enough that the receiver's queued writev() flushes more than once
+    data = os.urandom(500_000)
+    path = tmp_path / "out.bin"
+    with open(path, "wb") as out:
+        _transfer("gbn", data, out)
+    assert path.read_bytes() == data
+
+
+@pytest.mark.parametrize("protocol", ["sw", "gbn"])
+@pytest.mark.parametrize("skip", [0, 3, 20_000])
+@pytest.mark.parametrize("preserialize_max_bytes", [0, 1 << 20])
+def test_sender_maps_real_file_from_current_position(
+    tmp_path, protocol, skip, preserialize_max_bytes
+):
+    data = os.urandom(20_000)
+    path = tmp_path / "in.bin"
+    path.write_bytes(data)
+    out = io.BytesIO()
+    with open(path, "rb") as src:
+        src.seek(skip)
+        _transfer(
+            protocol, data[skip:], out, src, preserialize_max_bytes=preserialize_max_bytes
+        )
+        # mapped or not, src ends up where plain src.read() calls would leave it
+        assert src.tell() == len(data)
+    assert out.getvalue() == data[skip:]
+
+
+def test_sender_handles_empty_real_file(tmp_path):
+    path = tmp_path / "in.bin"
+    path.write_bytes(b"")
+    out = io.BytesIO()
+    with open(path, "rb") as src:
+        _transfer("gbn", b"", out, src)
+    assert out.getvalue() == b""
+
+
+def test_segment_reader_reads_past_the_mapping_when_the_file_grows(tmp_path):
+    # chunks are views into the mapping, each valid until the next read(); past
+    # the mapped size it switches to src.read(), so appended data is still
+    # sent, and close() unmaps and leaves src just past the data handed out
+    path = tmp_path / "in.bin"
+    path.write_bytes(b"a" * 2500)
+    with open(path, "rb") as src:
+        reader = _SegmentReader(src, 1000)
+        try:
+            chunks = [bytes(reader.read())]
+            with open(path, "ab") as grow:
+                grow.write(b"b" * 700)
+            while chunk := reader.read():
+                chunks.append(bytes(chunk))
+        finally:
+            reader.close()
+        assert b"".join(chunks) == b"a" * 2500 + b"b" * 700
+        assert src.tell() == 3200
+
+
+def test_receiver_writes_frames_before_acking_them(tmp_path):
+    path = tmp_path / "out.bin"
+    recv_ep = UdpEndpoint.listening("127.0.0.1", 0, timeout_ms=250)
+    send_ep = UdpEndpoint.sending(timeout_ms=1000)
+    with open(path, "wb") as out:
+        t = threading.Thread(target=Receiver(recv_ep, out).run, daemon=True)
+        t.start()
+        try:
+            dest = recv_ep.sock.getsockname()
+            send_ep.sendto(Frame.data_bytes(0, b"first"), dest)
+            ack, _ = send_ep.recvfrom()
+            assert Frame.parse_ack(ack) == 1
+            # ACKed but no FIN yet: the payload is already on disk
+            assert path.read_bytes() == b"first"
+            send_ep.sendto(Frame.data_bytes(1, b"", fin=True), dest)
+            t.join(timeout=5.0)
+            assert not t.is_alive()
+        finally:
+            send_ep.close()
+            recv_ep.close()
+    assert path.read_bytes() == b"first"